@@ -13,20 +13,86 @@ USAGE (run in an elevated PowerShell or CMD):
   python adobe_net_blocker.py block --no-hosts      # firewall only
   python adobe_net_blocker.py block --include-webview   # include WebView2 exe
   python adobe_net_blocker.py unblock --keep-hosts  # remove firewall rules but keep hosts entries
+
+PROFILES (per-product rules kept installed, toggled with enable=yes/no):
+  python adobe_net_blocker.py profiles              # scan, (re)install profile rules and list them
+  python adobe_net_blocker.py profile-off Photoshop # let Photoshop through (rules disabled, not deleted)
+  python adobe_net_blocker.py profile-on Photoshop  # block Photoshop again
+
+PRECOMPILED PLAN (fast logon-time enforcement):
+  python adobe_net_blocker.py plan          # scan once and write block_plan.json
+  python adobe_net_blocker.py apply-plan    # apply it without rescanning (rebuilt if roots/domains changed)
 """
 
 import argparse
 import ctypes
-import glob
+import json
 import os
+import random
 import re
+import signal
 import subprocess
 import sys
+import tempfile
+import time
 from pathlib import Path
 
 FIREWALL_RULE_PREFIX = "AdobeNetBlock"
 HOSTS_BEGIN = "# BEGIN ADOBE_NET_BLOCK"
 HOSTS_END = "# END ADOBE_NET_BLOCK"
+DOMAINS_FILE = Path(__file__).with_name("domains.txt")
+
+def state_dir():
+    # Persistent state must outlive a PyInstaller --onefile run, whose __file__ sits in a temp _MEI dir.
+    # %ProgramData% is also shared with the GUI exe.
+    base = os.environ.get("PROGRAMDATA")
+    if base:
+        return Path(base) / "AdobeNetBlocker"
+    if getattr(sys, "frozen", False):
+        return Path(sys.executable).parent
+    return Path(__file__).resolve().parent
+
+STATE_DIR = state_dir()
+PROFILES_FILE = STATE_DIR / "profiles.json"
+PROFILES_VERSION = 1
+
+PLAN_FILE = STATE_DIR / "block_plan.json"
+PLAN_VERSION = 3
+
+# Likely install locations of the executables to block
+CANDIDATE_PATTERNS = [
+    r"C:\Program Files\Adobe\**\Illustrator.exe",
+    r"C:\Program Files\Adobe\**\Photoshop.exe",
+    r"C:\Program Files\Adobe\**\Support Files\Contents\Windows\CEPHtmlEngine\CEPHtmlEngine.exe",
+    r"C:\Program Files\Adobe\**\AIMonitor.exe",
+    r"C:\Program Files\Common Files\Adobe\**\CCXProcess.exe",
+    r"C:\Users\*\AppData\Local\Programs\Common\**\CCXProcess.exe",
+]
+WEBVIEW2_PATTERN = r"C:\Program Files (x86)\Microsoft\EdgeWebView\Application\*\msedgewebview2.exe"
+
+# Profile assignment: first needle found in the lowercased path wins, otherwise "Adobe"
+PROFILE_MATCHERS = [
+    ("WebView2", "msedgewebview2.exe"),
+    ("CCX", "ccxprocess.exe"),
+    ("Photoshop", "photoshop"),
+    ("Illustrator", "illustrator"),
+]
+
+# Command runner robustness: a busy firewall service can hang netsh/schtasks indefinitely
+RUN_TIMEOUT = 15          # seconds before a hung command is killed
+RUN_RETRIES = 2           # extra attempts when the service manager/firewall service is unreachable
+RUN_BACKOFF = 0.5         # base delay in seconds, doubled per attempt, full jitter
+BREAKER_THRESHOLD = 3     # consecutive transient failures before a tool is considered down (a timeout is enough)
+BREAKER_COOLDOWN = 30     # seconds during which calls to a down tool fail fast
+BATCH_TIMEOUT_PER_COMMAND = 0.5  # extra seconds granted per line of a netsh -f script
+
+# Lowercased fragments of netsh/sc/schtasks output meaning the service manager or firewall service is
+# unreachable. Answers about the *target* service (1062 not started, 1058 disabled...) are normal results.
+TRANSIENT_MARKERS = (
+    "rpc server is unavailable",
+    "serveur rpc n'est pas disponible",
+    "contact the windows firewall service",
+)
 
 # Default domains to block via hosts (customize by creating a domains.txt next to this script)
 DEFAULT_DOMAINS = [
@@ -51,22 +117,124 @@ def is_admin():
     except:
         return False
 
-def run(cmd):
-    completed = subprocess.run(cmd, capture_output=True, text=True, shell=True)
-    return completed.returncode, completed.stdout.strip(), completed.stderr.strip()
+_breakers = {}  # tool name -> {"failures": consecutive transient failures, "open_until": monotonic time}
+
+def _tool_of(cmd):
+    parts = cmd.strip().split(None, 1)
+    return os.path.splitext(os.path.basename(parts[0]))[0].lower() if parts else ""
+
+def _kill_tree(proc):
+    # The shell is only the parent: kill netsh/schtasks too, or they keep the pipes open
+    try:
+        if os.name == "nt":
+            subprocess.run(f"taskkill /F /T /PID {proc.pid}", capture_output=True, shell=True)
+        else:
+            os.killpg(proc.pid, signal.SIGKILL)
+    except OSError:
+        proc.kill()
+
+def _run_once(cmd, timeout):
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, shell=True,
+                            start_new_session=(os.name != "nt"))
+    try:
+        out, err = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        _kill_tree(proc)
+        try:
+            proc.communicate(timeout=5)
+        except subprocess.TimeoutExpired:
+            pass
+        return None, "", f"timed out after {timeout}s"
+    return proc.returncode, (out or "").strip(), (err or "").strip()
+
+def tool_down(tool):
+    breaker = _breakers.get(tool)
+    return breaker is not None and time.monotonic() < breaker["open_until"]
+
+def run(cmd, timeout=RUN_TIMEOUT, retries=RUN_RETRIES):
+    tool = _tool_of(cmd)
+    breaker = _breakers.setdefault(tool, {"failures": 0, "open_until": 0.0})
+    for attempt in range(retries + 1):
+        if tool_down(tool):
+            return -1, "", f"{tool} unavailable, command skipped (circuit open)"
+        try:
+            rc, out, err = _run_once(cmd, timeout)
+        except OSError as e:
+            return -1, "", str(e)
+        if rc is None:
+            # Hung: never replayed (a second 'add rule' could duplicate it, and each try costs a full
+            # timeout on the GUI thread). The tool is treated as down straight away.
+            breaker["failures"] = BREAKER_THRESHOLD
+        elif rc == 0 or not any(m in f"{out} {err}".lower() for m in TRANSIENT_MARKERS):
+            breaker["failures"] = 0
+            return rc, out, err
+        else:
+            breaker["failures"] += 1
+        if breaker["failures"] >= BREAKER_THRESHOLD:
+            breaker["open_until"] = time.monotonic() + BREAKER_COOLDOWN
+            return -1, out, f"{err} ({tool} looks down, skipping its commands for {BREAKER_COOLDOWN}s)"
+        if attempt < retries:
+            time.sleep(random.uniform(0, RUN_BACKOFF * 2 ** attempt))
+    return rc, out, err
+
+def run_netsh_batch(commands):
+    # Feed all commands to a single netsh process (netsh -f) instead of spawning one per rule
+    if not commands:
+        return 0, "", ""
+    try:
+        fd, script = tempfile.mkstemp(prefix="adobe_net_block_", suffix=".txt")
+    except OSError as e:
+        return -1, "", f"Unable to create netsh script: {e}"
+    try:
+        try:
+            # UTF-16 with BOM is read as Unicode by netsh: paths outside the ANSI code page survive
+            with os.fdopen(fd, "w", encoding="utf-16") as f:
+                f.write("\n".join(commands) + "\n")
+        except (OSError, UnicodeError) as e:
+            return -1, "", f"Unable to write netsh script: {e}"
+        # No blind retry: a script killed halfway must not be replayed, callers decide what to do
+        timeout = RUN_TIMEOUT + BATCH_TIMEOUT_PER_COMMAND * len(commands)
+        return run(f'netsh -f "{script}"', timeout=timeout, retries=0)
+    finally:
+        try:
+            os.remove(script)
+        except OSError:
+            pass
+
+def run_netsh_idempotent(commands):
+    # Only for delete/set lines: replaying them is harmless, so a script netsh stopped halfway
+    # is finished one command at a time. Returns the commands that still failed.
+    rc, out, err = run_netsh_batch(commands)
+    if rc == 0:
+        return []
+    failed = []
+    for cmd in commands:
+        rc, out, err = run(f"netsh {cmd}")
+        if rc != 0:
+            failed.append(cmd)
+    return failed
+
+def existing_rule_names():
+    # Inside netsh -f the first rule that does not match aborts the rest of the script,
+    # so deletes/sets are only issued for rules listed here. None when netsh cannot answer.
+    rc, out, err = run("netsh advfirewall firewall show rule name=all")
+    if rc != 0:
+        return None
+    names = set()
+    for line in out.splitlines():
+        label, sep, value = line.partition(":")
+        value = value.strip()
+        if sep and value.startswith(FIREWALL_RULE_PREFIX):
+            names.add(value)
+    return names
 
 def find_candidates(include_webview=False):
-    # Expand likely install locations
-    patterns = [
-        r"C:\Program Files\Adobe\**\Illustrator.exe",
-        r"C:\Program Files\Adobe\**\Photoshop.exe",
-        r"C:\Program Files\Adobe\**\Support Files\Contents\Windows\CEPHtmlEngine\CEPHtmlEngine.exe",
-        r"C:\Program Files\Adobe\**\AIMonitor.exe",
-        r"C:\Program Files\Common Files\Adobe\**\CCXProcess.exe",
-        r"C:\Users\*\AppData\Local\Programs\Common\**\CCXProcess.exe",
-    ]
+    # Imported here so apply-plan never pays for the scanner
+    import glob
+
+    patterns = list(CANDIDATE_PATTERNS)
     if include_webview:
-        patterns.append(r"C:\Program Files (x86)\Microsoft\EdgeWebView\Application\*\msedgewebview2.exe")
+        patterns.append(WEBVIEW2_PATTERN)
 
     found = []
     for pat in patterns:
@@ -94,6 +262,9 @@ def rule_name_for(path, direction):
 def add_firewall_rules(paths):
     any_error = False
     for path in paths:
+        if tool_down("netsh"):
+            print("[!] netsh is not responding, remaining rules skipped.")
+            return False
         for direction in ("out", "in"):
             name = rule_name_for(path, direction)
             cmd = f'netsh advfirewall firewall add rule name="{name}" dir={direction} action=block program="{path}" enable=yes profile=any'
@@ -118,26 +289,159 @@ def delete_firewall_rules():
     # Attempt delete per known directions and generic wildcard
     deleted_any = False
     for direction in ("out", "in"):
+        if tool_down("netsh"):
+            print("[!] netsh is not responding, remaining deletions skipped.")
+            return False
         rc2, out2, err2 = run(f'netsh advfirewall firewall delete rule name=all dir={direction} program=any | findstr /I "{pattern}"')
         if out2 or err2:
             deleted_any = True
     # Also try deleting by explicit names that match our pattern
     # (Windows netsh doesn't support wildcards in delete by name; so we just try common exe bases)
     for base in ["Illustrator.exe", "Photoshop.exe", "CEPHtmlEngine.exe", "AIMonitor.exe", "CCXProcess.exe", "msedgewebview2.exe"]:
+        if tool_down("netsh"):
+            print("[!] netsh is not responding, remaining deletions skipped.")
+            return False
         for direction in ("out", "in"):
             name = f'{FIREWALL_RULE_PREFIX} [{direction}] {base}'
             run(f'netsh advfirewall firewall delete rule name="{name}"')
     print("[=] Requested deletion of firewall rules with prefix", FIREWALL_RULE_PREFIX)
     return True
 
+def profile_for(path):
+    low = path.lower()
+    for name, needle in PROFILE_MATCHERS:
+        if needle in low:
+            return name
+    return "Adobe"
+
+def profile_rule_name_for(profile, path, direction):
+    base = Path(path).name
+    return f"{FIREWALL_RULE_PREFIX} [{profile}] [{direction}] {base}"
+
+def load_profiles():
+    try:
+        data = json.loads(PROFILES_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != PROFILES_VERSION:
+        return {}
+    return data.get("profiles", {})
+
+def save_profiles(profiles):
+    try:
+        PROFILES_FILE.parent.mkdir(parents=True, exist_ok=True)
+        PROFILES_FILE.write_text(json.dumps({"version": PROFILES_VERSION, "profiles": profiles}, indent=2), encoding="utf-8")
+        return True
+    except Exception as e:
+        print(f"[!] Unable to write profiles ({PROFILES_FILE}): {e}")
+        return False
+
+def install_profiles(paths):
+    # Group scan results per product and (re)create their rules once; later toggles only flip enable=
+    previous = load_profiles()
+    profiles = {}
+    for path in paths:
+        name = profile_for(path)
+        enabled = previous.get(name, {}).get("enabled", True)
+        profiles.setdefault(name, {"enabled": enabled, "programs": [], "rules": []})
+        profiles[name]["programs"].append(path)
+
+    existing = existing_rule_names()
+    if existing is None:
+        print("[!] Unable to list existing firewall rules, profiles not installed.")
+        return False
+
+    stale, adds = [], []
+    for prof in previous.values():
+        stale.extend(prof.get("rules", []))
+    for name, prof in profiles.items():
+        flag = "yes" if prof["enabled"] else "no"
+        for path in prof["programs"]:
+            for direction in ("out", "in"):
+                rule = profile_rule_name_for(name, path, direction)
+                if rule not in prof["rules"]:
+                    prof["rules"].append(rule)
+                    stale.append(rule)
+                adds.append(f'advfirewall firewall add rule name="{rule}" dir={direction} action=block program="{path}" enable={flag} profile=any')
+
+    # Deletes first so duplicate names (same exe in two versions) don't remove freshly added rules.
+    # A leftover rule would be duplicated by the adds, so any delete failure stops the install.
+    deletes = [f'advfirewall firewall delete rule name="{rule}"' for rule in dict.fromkeys(stale) if rule in existing]
+    failed = run_netsh_idempotent(deletes)
+    if failed:
+        print(f"[!] Failed to remove {len(failed)} previous profile rules, profiles not reinstalled.")
+        return False
+    rc, out, err = run_netsh_batch(adds)
+    if rc != 0:
+        print(f"[!] Failed to install profile rules: {err or out}")
+        return False
+    for name, prof in profiles.items():
+        print(f"[+] Profile {name}: {len(prof['rules'])} rules ({'on' if prof['enabled'] else 'off'})")
+    return save_profiles(profiles)
+
+def set_profiles_enabled(names, enabled):
+    profiles = load_profiles()
+    if not profiles:
+        print("[!] No profiles installed. Run the 'profiles' action first.")
+        return False
+    by_lower = {n.lower(): n for n in profiles}
+    selected = []
+    for n in names:
+        key = by_lower.get(n.lower())
+        if key is None:
+            print(f"[!] Unknown profile: {n} (known: {', '.join(profiles)})")
+            return False
+        selected.append(key)
+
+    existing = existing_rule_names()
+    if existing is None:
+        print("[!] Unable to list existing firewall rules, nothing switched.")
+        return False
+
+    flag = "yes" if enabled else "no"
+    rules = [rule for key in selected for rule in profiles[key]["rules"]]
+    missing = [rule for rule in rules if rule not in existing]
+    if missing:
+        print(f"[!] {len(missing)} profile rules are missing, run the 'profiles' action again: {', '.join(missing)}")
+    failed = run_netsh_idempotent([f'advfirewall firewall set rule name="{rule}" new enable={flag}' for rule in rules if rule in existing])
+
+    # Plain rules from block/apply-plan would keep the program blocked: switch those too.
+    # When disabling, leave alone names still needed by another blocked profile (e.g. a shared CEPHtmlEngine.exe).
+    plain = {rule_name_for(p, d) for key in selected for p in profiles[key]["programs"] for d in ("out", "in")}
+    if not enabled:
+        for name, prof in profiles.items():
+            if name not in selected and prof.get("enabled"):
+                plain -= {rule_name_for(p, d) for p in prof["programs"] for d in ("out", "in")}
+    failed += run_netsh_idempotent([f'advfirewall firewall set rule name="{rule}" new enable={flag}' for rule in sorted(plain & existing)])
+    if failed:
+        # profiles.json keeps the previous state: rerunning the same switch is safe
+        print(f"[!] Failed to switch profile(s) {', '.join(selected)}:")
+        for cmd in failed:
+            print("    -", cmd)
+        return False
+
+    for key in selected:
+        profiles[key]["enabled"] = enabled
+        print(f"[=] Profile {key}: {'blocked' if enabled else 'allowed'} ({len(profiles[key]['rules'])} rules)")
+    return save_profiles(profiles)
+
+def list_profiles():
+    profiles = load_profiles()
+    if not profiles:
+        print("[=] No profiles installed.")
+        return
+    print("== Profiles ==")
+    for name, prof in profiles.items():
+        state = "on (blocked)" if prof.get("enabled") else "off (allowed)"
+        print(f" - {name}: {state}, {len(prof.get('programs', []))} executables")
+
 def hosts_path():
     return r"C:\Windows\System32\drivers\etc\hosts"
 
 def read_domains():
-    local_txt = Path(__file__).with_name("domains.txt")
-    if local_txt.exists():
+    if DOMAINS_FILE.exists():
         items = []
-        for line in local_txt.read_text(encoding="utf-8", errors="ignore").splitlines():
+        for line in DOMAINS_FILE.read_text(encoding="utf-8", errors="ignore").splitlines():
             t = line.strip()
             if t and not t.startswith("#"):
                 items.append(t)
@@ -145,7 +449,15 @@ def read_domains():
             return items
     return DEFAULT_DOMAINS
 
-def ensure_hosts_block(add=True):
+def normalize_domains(domains):
+    items = []
+    for d in domains:
+        t = d.strip().lower().rstrip(".")
+        if t and t not in items:
+            items.append(t)
+    return items
+
+def ensure_hosts_block(add=True, domains=None):
     hp = hosts_path()
     try:
         text = Path(hp).read_text(encoding="utf-8", errors="ignore")
@@ -158,7 +470,7 @@ def ensure_hosts_block(add=True):
 
     if add:
         lines = [HOSTS_BEGIN]
-        for d in read_domains():
+        for d in (domains if domains is not None else read_domains()):
             lines.append(f"0.0.0.0 {d}")
             lines.append(f"::1 {d}")
         lines.append(HOSTS_END)
@@ -175,6 +487,116 @@ def ensure_hosts_block(add=True):
         print(f"[!] Unable to write hosts ({hp}): {e}")
         return False
 
+def plan_roots(include_webview=False):
+    # Deepest existing fixed directory of each pattern (the part before "**"). A "*" level such as
+    # C:\Users\* is listed, so a CCXProcess installed into an existing profile still touches a root.
+    patterns = CANDIDATE_PATTERNS + ([WEBVIEW2_PATTERN] if include_webview else [])
+    roots = []
+    for pat in patterns:
+        parts = re.split(r"[\\/]", pat)
+        fixed = parts[:parts.index("**")] if "**" in parts else parts[:-1]
+        branches = [(parts[0] + os.sep, True)]  # (directory, still descending)
+        for part in fixed[1:]:
+            if "*" in part and part != "*":
+                break
+            nxt = []
+            for d, alive in branches:
+                if not alive:
+                    nxt.append((d, False))
+                elif part == "*":
+                    try:
+                        nxt.extend((e.path, True) for e in sorted(os.scandir(d), key=lambda e: e.name) if e.is_dir())
+                    except OSError:
+                        nxt.append((d, False))
+                else:
+                    child = os.path.join(d, part)
+                    nxt.append((child, True) if os.path.isdir(child) else (d, False))
+            branches = nxt
+        for d, _ in branches:
+            if d not in roots:
+                roots.append(d)
+    return roots
+
+def plan_fingerprint(include_webview=False):
+    # Installing/removing a product touches its root directory, so stat'ing roots is enough (no tree walk).
+    # Updates deep inside an existing product folder are not seen; they are caught by plan_is_current only
+    # when a planned executable disappears.
+    fp = {}
+    for p in plan_roots(include_webview) + [str(DOMAINS_FILE)]:
+        try:
+            st = os.stat(p)
+            fp[p] = [st.st_mtime_ns, st.st_size]
+        except OSError:
+            fp[p] = None
+    return fp
+
+def build_plan(include_webview=False):
+    # Fingerprint before scanning: anything installed meanwhile makes the plan stale, never silently missing
+    fingerprint = plan_fingerprint(include_webview)
+    programs = find_candidates(include_webview=include_webview)
+    deletes, adds = [], []
+    for path in programs:
+        for direction in ("out", "in"):
+            name = rule_name_for(path, direction)
+            if name not in deletes:
+                deletes.append(name)
+            adds.append(f'advfirewall firewall add rule name="{name}" dir={direction} action=block program="{path}" enable=yes profile=any')
+    return {
+        "version": PLAN_VERSION,
+        "webview": include_webview,
+        "fingerprint": fingerprint,
+        "programs": programs,
+        "deletes": deletes,
+        "adds": adds,
+        "domains": normalize_domains(read_domains()),
+    }
+
+def save_plan(plan, path=PLAN_FILE):
+    try:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(json.dumps(plan, separators=(",", ":")), encoding="utf-8")
+        return True
+    except Exception as e:
+        print(f"[!] Unable to write plan ({path}): {e}")
+        return False
+
+def load_plan(path=PLAN_FILE):
+    try:
+        plan = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(plan, dict) or plan.get("version") != PLAN_VERSION:
+        return None
+    return plan
+
+def plan_is_current(plan):
+    if plan["fingerprint"] != plan_fingerprint(plan["webview"]):
+        return False
+    return all(os.path.isfile(p) for p in plan["programs"])
+
+def apply_plan(plan, hosts=True):
+    ok_fw = True
+    if plan["programs"]:
+        # Only delete rules that exist (netsh -f stops at the first miss). Blocking wins over tidiness:
+        # if the cleanup cannot be done the adds still run, at worst duplicating some rules.
+        existing = existing_rule_names()
+        if existing is None:
+            print("[!] Unable to list existing firewall rules, adding without cleanup.")
+        else:
+            failed = run_netsh_idempotent([f'advfirewall firewall delete rule name="{name}"' for name in plan["deletes"] if name in existing])
+            if failed:
+                print(f"[!] {len(failed)} previous rules could not be removed and may be duplicated.")
+        rc, out, err = run_netsh_batch(plan["adds"])
+        if rc != 0:
+            print(f"[!] Failed to apply firewall rules from plan: {err or out}")
+            ok_fw = False
+        else:
+            print(f"[+] Applied {len(plan['programs']) * 2} firewall rules from plan")
+    else:
+        print("[!] Plan contains no executables. Only hosts blocking will be applied.")
+    ok_hosts = ensure_hosts_block(add=True, domains=plan["domains"]) if hosts else True
+    return ok_fw and ok_hosts
+
 def status(include_webview=False):
     print("== Candidate executables ==")
     for p in find_candidates(include_webview=include_webview):
@@ -186,10 +608,12 @@ def status(include_webview=False):
 
 def main():
     parser = argparse.ArgumentParser(description="Toggle network access for Adobe apps via Windows Firewall and hosts file.")
-    parser.add_argument("action", choices=["block","unblock","status"])
+    parser.add_argument("action", choices=["block","unblock","status","profiles","profile-on","profile-off","plan","apply-plan"])
+    parser.add_argument("profile_names", nargs="*", metavar="PROFILE", help="Profile names for profile-on/profile-off (e.g. Photoshop, Illustrator, CCX, WebView2)")
     parser.add_argument("--no-hosts", action="store_true", help="Skip hosts-file modification")
     parser.add_argument("--keep-hosts", action="store_true", help="When unblocking, keep hosts-file block")
     parser.add_argument("--include-webview", action="store_true", help="Also block Edge WebView2 used by Photoshop (may affect other apps)")
+    parser.add_argument("--plan", default=str(PLAN_FILE), help="Plan file used by plan/apply-plan")
     args = parser.parse_args()
 
     if not is_admin():
@@ -200,6 +624,40 @@ def main():
 
     if args.action == "status":
         status(include_webview=include_webview)
+        list_profiles()
+        return
+
+    if args.action == "profiles":
+        exe_paths = find_candidates(include_webview=include_webview)
+        if not exe_paths:
+            print("[!] No Adobe executables found in standard locations.")
+        elif install_profiles(exe_paths):
+            list_profiles()
+        return
+
+    if args.action in ("profile-on", "profile-off"):
+        if not args.profile_names:
+            parser.error(f"{args.action} needs at least one profile name")
+        if set_profiles_enabled(args.profile_names, args.action == "profile-on"):
+            print("[✓] Profile switch applied.")
+        return
+
+    if args.action == "plan":
+        plan = build_plan(include_webview=include_webview)
+        if save_plan(plan, args.plan):
+            print(f"[✓] Plan written to {args.plan}: {len(plan['programs'])} executables, {len(plan['domains'])} domains.")
+        return
+
+    if args.action == "apply-plan":
+        plan = load_plan(args.plan)
+        if plan is None or plan["webview"] != include_webview or not plan_is_current(plan):
+            print("[=] Plan missing, out of date or built with other options, rebuilding it.")
+            plan = build_plan(include_webview=include_webview)
+            save_plan(plan, args.plan)
+        if apply_plan(plan, hosts=not args.no_hosts):
+            print("[✓] Blocking applied.")
+        else:
+            print("[!] Some steps failed. See messages above.")
         return
 
     if args.action == "block":
@@ -218,6 +676,10 @@ def main():
 
     if args.action == "unblock":
         delete_firewall_rules()
+        installed = load_profiles()
+        if installed:
+            # Profile rules stay installed; just switch them off
+            set_profiles_enabled(list(installed), False)
         if not args.keep_hosts:
             ensure_hosts_block(add=False)
         print("[✓] Unblocking requested.")
@@ -14,10 +14,15 @@ Run as Administrator.
 
 import ctypes
 import glob
+import json
 import os
+import random
 import re
+import signal
 import subprocess
 import sys
+import tempfile
+import time
 from pathlib import Path
 import csv
 import io
@@ -35,6 +40,21 @@ ADOBE_SERVICES = [
     "AdobeARMservice",
 ]
 
+# Command runner robustness: a busy firewall service can hang netsh/schtasks indefinitely
+RUN_TIMEOUT = 15          # seconds before a hung command is killed
+RUN_RETRIES = 2           # extra attempts when the service manager/firewall service is unreachable
+RUN_BACKOFF = 0.5         # base delay in seconds, doubled per attempt, full jitter
+BREAKER_THRESHOLD = 3     # consecutive transient failures before a tool is considered down (a timeout is enough)
+BREAKER_COOLDOWN = 30     # seconds during which calls to a down tool fail fast
+
+# Lowercased fragments of netsh/sc/schtasks output meaning the service manager or firewall service is
+# unreachable. Answers about the *target* service (1062 not started, 1058 disabled...) are normal results.
+TRANSIENT_MARKERS = (
+    "rpc server is unavailable",
+    "serveur rpc n'est pas disponible",
+    "contact the windows firewall service",
+)
+
 DEFAULT_DOMAINS = [
     "adobe.com",
     "adobelogin.com",
@@ -61,18 +81,84 @@ def script_dir():
 
 DOMAINS_FILE = script_dir() / "domains.txt"
 
+def state_dir():
+    # Same location as the CLI: profiles.json must outlive the --onefile temp dir and be shared by both exes
+    base = os.environ.get("PROGRAMDATA")
+    if base:
+        return Path(base) / "AdobeNetBlocker"
+    if getattr(sys, "frozen", False):
+        return Path(sys.executable).parent
+    return Path(__file__).resolve().parent
+
+PROFILES_FILE = state_dir() / "profiles.json"
+PROFILES_VERSION = 1
+BATCH_TIMEOUT_PER_COMMAND = 0.5  # extra seconds granted per line of a netsh -f script
+
 def is_admin():
     try:
         return ctypes.windll.shell32.IsUserAnAdmin()
     except Exception:
         return False
 
-def run(cmd):
-    completed = subprocess.run(cmd, capture_output=True, text=True, shell=True)
-    # Robust against None stdout/stderr
-    out = (completed.stdout or "").strip()
-    err = (completed.stderr or "").strip()
-    return completed.returncode, out, err
+_breakers = {}  # tool name -> {"failures": consecutive transient failures, "open_until": monotonic time}
+
+def _tool_of(cmd):
+    parts = cmd.strip().split(None, 1)
+    return os.path.splitext(os.path.basename(parts[0]))[0].lower() if parts else ""
+
+def _kill_tree(proc):
+    # The shell is only the parent: kill netsh/schtasks too, or they keep the pipes open
+    try:
+        if os.name == "nt":
+            subprocess.run(f"taskkill /F /T /PID {proc.pid}", capture_output=True, shell=True)
+        else:
+            os.killpg(proc.pid, signal.SIGKILL)
+    except OSError:
+        proc.kill()
+
+def _run_once(cmd, timeout):
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, shell=True,
+                            start_new_session=(os.name != "nt"))
+    try:
+        out, err = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        _kill_tree(proc)
+        try:
+            proc.communicate(timeout=5)
+        except subprocess.TimeoutExpired:
+            pass
+        return None, "", f"délai dépassé ({timeout}s)"
+    return proc.returncode, (out or "").strip(), (err or "").strip()
+
+def tool_down(tool):
+    breaker = _breakers.get(tool)
+    return breaker is not None and time.monotonic() < breaker["open_until"]
+
+def run(cmd, timeout=RUN_TIMEOUT, retries=RUN_RETRIES):
+    tool = _tool_of(cmd)
+    breaker = _breakers.setdefault(tool, {"failures": 0, "open_until": 0.0})
+    for attempt in range(retries + 1):
+        if tool_down(tool):
+            return -1, "", f"{tool} indisponible, commande ignorée (circuit ouvert)"
+        try:
+            rc, out, err = _run_once(cmd, timeout)
+        except OSError as e:
+            return -1, "", str(e)
+        if rc is None:
+            # Hung: never replayed (a second 'add rule' could duplicate it, and each try costs a full
+            # timeout on the GUI thread). The tool is treated as down straight away.
+            breaker["failures"] = BREAKER_THRESHOLD
+        elif rc == 0 or not any(m in f"{out} {err}".lower() for m in TRANSIENT_MARKERS):
+            breaker["failures"] = 0
+            return rc, out, err
+        else:
+            breaker["failures"] += 1
+        if breaker["failures"] >= BREAKER_THRESHOLD:
+            breaker["open_until"] = time.monotonic() + BREAKER_COOLDOWN
+            return -1, out, f"{err} ({tool} semble hors service, commandes ignorées pendant {BREAKER_COOLDOWN}s)"
+        if attempt < retries:
+            time.sleep(random.uniform(0, RUN_BACKOFF * 2 ** attempt))
+    return rc, out, err
 
 def hosts_path():
     return r"C:\Windows\System32\drivers\etc\hosts"
@@ -167,6 +253,9 @@ def add_firewall_rules(paths):
     any_error = False
     logs = []
     for path in paths:
+        if tool_down("netsh"):
+            logs.append("netsh ne répond plus, règles restantes ignorées.")
+            return False, "\n".join(logs)
         for direction in ("out", "in"):
             name = rule_name_for(path, direction)
             cmd = f'netsh advfirewall firewall add rule name="{name}" dir={direction} action=block program="{path}" enable=yes profile=any'
@@ -189,6 +278,9 @@ def delete_firewall_rules():
     candidates = find_all_adobe_executables(include_webview=True)
     bases = sorted(set(base_name(p) for p in candidates) | {"msedgewebview2.exe"})
     for base in bases:
+        if tool_down("netsh"):
+            logs.append("netsh ne répond plus, suppressions restantes ignorées.")
+            return False, "\n".join(logs)
         for direction in ("out", "in"):
             name = f'{FIREWALL_RULE_PREFIX} [{direction}] {base}'
             rc, out, err = run(f'netsh advfirewall firewall delete rule name="{name}"')
@@ -196,6 +288,71 @@ def delete_firewall_rules():
                 logs.append(f"Supprimée: {name}")
     return True, "\n".join(logs)
 
+# ----- Profiles installed by the CLI ('profiles' action) -----
+
+def run_netsh_batch(commands):
+    # One netsh process for all lines; UTF-16 with BOM so non-ANSI paths survive
+    if not commands:
+        return 0, "", ""
+    try:
+        fd, script = tempfile.mkstemp(prefix="adobe_net_block_", suffix=".txt")
+    except OSError as e:
+        return -1, "", f"Script netsh impossible à créer: {e}"
+    try:
+        try:
+            with os.fdopen(fd, "w", encoding="utf-16") as f:
+                f.write("\n".join(commands) + "\n")
+        except (OSError, UnicodeError) as e:
+            return -1, "", f"Script netsh impossible à écrire: {e}"
+        timeout = RUN_TIMEOUT + BATCH_TIMEOUT_PER_COMMAND * len(commands)
+        return run(f'netsh -f "{script}"', timeout=timeout, retries=0)
+    finally:
+        try:
+            os.remove(script)
+        except OSError:
+            pass
+
+def existing_rule_names():
+    # netsh -f stops at the first rule that does not match: only touch rules that exist
+    rc, out, err = run("netsh advfirewall firewall show rule name=all")
+    if rc != 0:
+        return None
+    names = set()
+    for line in out.splitlines():
+        label, sep, value = line.partition(":")
+        value = value.strip()
+        if sep and value.startswith(FIREWALL_RULE_PREFIX):
+            names.add(value)
+    return names
+
+def profiles_switch_off():
+    # Profile rules stay installed: unblocking only sets enable=no, like the CLI 'unblock'
+    try:
+        data = json.loads(PROFILES_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return True, ""
+    profiles = data.get("profiles", {}) if data.get("version") == PROFILES_VERSION else {}
+    if not profiles:
+        return True, ""
+    existing = existing_rule_names()
+    if existing is None:
+        return False, "Profils: impossible de lister les règles du pare-feu."
+    cmds = [f'advfirewall firewall set rule name="{rule}" new enable=no'
+            for prof in profiles.values() for rule in prof.get("rules", []) if rule in existing]
+    rc, out, err = run_netsh_batch(cmds)
+    if rc != 0:
+        # Replaying a set is harmless: finish one command at a time
+        failed = [c for c in cmds if run(f"netsh {c}")[0] != 0]
+        if failed:
+            return False, f"Profils: {len(failed)} règles non désactivées."
+    for prof in profiles.values():
+        prof["enabled"] = False
+    try:
+        PROFILES_FILE.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    except Exception as e:
+        return False, f"Profils: écriture de {PROFILES_FILE} échouée: {e}"
+    return True, f"Profils désactivés: {', '.join(profiles)}"
+
 # ----- Aggressive: services + tasks -----
 
 def service_stop_disable(svc_name):
@@ -456,6 +613,9 @@ class App(tk.Tk):
             return
         ok_fw, log_fw = delete_firewall_rules()
         self.log_write(log_fw)
+        ok_prof, log_prof = profiles_switch_off()
+        if log_prof:
+            self.log_write(log_prof)
         if self.use_hosts.get():
             ok_hosts, err = ensure_hosts_block(add=False)
             if ok_hosts: